@@ -12,9 +12,22 @@ class Backtester:
     """
     A class for backtesting strategies on all trading pairs.
     """
-    def __init__(self, strategy: StrategyBase, strategy_name: str, project_dir: Path, results_dir: str = "results"):
+    def __init__(self, strategy: StrategyBase, strategy_name: str, project_dir: Path, results_dir: str = "results",
+                 cash_sharing: bool = False, init_cash: float = 10000, max_positions: int = 10,
+                 position_size: float = None):
+        """
+        :param cash_sharing: backtest all pairs as one portfolio with a shared cash pool
+            instead of an independent portfolio per pair
+        :param init_cash: initial cash of the shared portfolio
+        :param max_positions: maximal number of concurrently open positions of the shared portfolio
+        :param position_size: fraction of the shared portfolio value per position (1 / max_positions by default)
+        """
         self.strategy = strategy
         self.strategy_name = strategy_name
+        self.cash_sharing = cash_sharing
+        self.init_cash = init_cash
+        self.max_positions = max_positions
+        self.position_size = position_size
         self.results_dir = os.path.join(project_dir, results_dir)
         self.screenshots_dir = os.path.join(results_dir, "screenshots")
         self.html_dir = os.path.join(results_dir, "html")
@@ -31,7 +44,14 @@ class Backtester:
         Performs backtests, calculates metrics, and generates graphical results.
         return: result metrics
         """
-        portfolio = self.strategy.run_backtest()
+        if self.cash_sharing:
+            portfolio = self.strategy.run_shared_cash_backtest(
+                init_cash=self.init_cash,
+                max_positions=self.max_positions,
+                position_size=self.position_size
+            )
+        else:
+            portfolio = self.strategy.run_backtest()
         self._plot_equity_curve(portfolio)
         self._plot_heatmap(portfolio)
 
@@ -67,6 +87,9 @@ class Backtester:
         :param portfolio: backtest results
         """
         total_returns = portfolio.total_return()
+        if not isinstance(total_returns, (pd.DataFrame, pd.Series)):
+            # a shared cash portfolio is grouped into a single column and returns a scalar
+            total_returns = pd.Series([total_returns], index=portfolio.wrapper.get_columns())
         if isinstance(total_returns, pd.Series):
             total_returns = pd.DataFrame([total_returns.values], columns=total_returns.index)
 
@@ -1,11 +1,14 @@
 import os
 import time
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import pandas as pd
 import ccxt
 from loguru import logger
 
+from core.liquidity_index import LiquidityIndex
+from core.trade_aggregator import TradeAggregator
+
 
 class DataLoader:
 
@@ -19,13 +22,22 @@ class DataLoader:
             'enableRateLimit': True,
         })
         self.pairs = []
+        self.liquidity_index = LiquidityIndex(self.output_folder)
 
-    def get_top_liquid_pairs(self, n) -> list:
+    def get_top_liquid_pairs(self, n, as_of: str = None, lookback_days: int = 1) -> list:
         """
-        Gets the top n liquid pairs to BTC using ticker data from Binance
+        Gets the top n liquid pairs to BTC using ticker data from Binance,
+        or from the local liquidity index for a historical date if as_of is given
         :param n: num of pairs
+        :param as_of: point-in-time selection date, uses only the days before it
+        :param lookback_days: number of days before as_of to rank the pairs over
         :return: list of top n liquid pairs to BTC
         """
+        if as_of is not None:
+            top_pairs = self.liquidity_index.top_n(as_of, n, lookback_days=lookback_days, quote="BTC")
+            self.pairs = top_pairs.copy()
+            return top_pairs
+
         markets = self.exchange.load_markets()
         tickers = self.exchange.fetch_tickers()
         btc_pairs = []
@@ -78,13 +90,14 @@ class DataLoader:
         df.fillna(0, inplace=True)
         return df
 
-    def download_data(self, n) -> pd.DataFrame:
+    def download_data(self, n, as_of: str = None) -> pd.DataFrame:
         """
         Uploads data for the top 100 pairs to BTC and returns a summary DataFrame with multi-index columns
         :param n: num of pairs
+        :param as_of: point-in-time selection date for the liquidity index, live tickers if None
         :return: summary DataFrame with multi-index columns
         """
-        top_pairs = self.get_top_liquid_pairs(n)
+        top_pairs = self.get_top_liquid_pairs(n, as_of=as_of)
         logger.info(f"Топ {n} pairs: {top_pairs}")
         data_frames = []
         for symbol in top_pairs:
@@ -109,9 +122,9 @@ class DataLoader:
         :param df: pandas DataFrame
         :param filename: file to save data
         """
-        if not os.path.exists(self.output_folder):
-            os.makedirs(self.output_folder)
         filepath = os.path.join(self.output_folder, filename)
+        if not os.path.exists(os.path.dirname(filepath)):
+            os.makedirs(os.path.dirname(filepath))
         df.to_parquet(filepath, compression='snappy')
 
     def load_cached_data(self, filename: str) -> pd.DataFrame | None:
@@ -134,24 +147,69 @@ class DataLoader:
         """
         return not df.isnull().any().any()
 
-    def process(self, num_of_pairs: int, filename: str = "btc_1m_feb25.parquet") -> Tuple[List, pd.DataFrame]:
+    def ingest_trades(self, trade_files: Dict[str, str], filename: str,
+                      max_workers: int = None) -> Tuple[List, pd.DataFrame]:
+        """
+        Builds 1m bars from local raw trade dumps instead of exchange candles and caches them,
+        so that process() can later pick them up with the same filename.
+        :param trade_files: mapping of symbol to trade file path (CSV or parquet)
+        :param filename: name of cache file
+        :param max_workers: number of worker processes, one symbol per worker
+        :return: list of pairs and result pandas dataframe
+        """
+        aggregator = TradeAggregator(self.start_date, self.end_date, bar_type="time", max_workers=max_workers)
+        df = aggregator.process(trade_files)
+        self.save_data(df, filename)
+        self.liquidity_index.update(df)
+        self.pairs = aggregator.pairs.copy()
+        return self.pairs, df
+
+    def ingest_trade_bars(self, trade_files: Dict[str, str], bar_type: str, threshold: float,
+                          max_workers: int = None) -> Dict[str, pd.DataFrame]:
+        """
+        Builds volume or dollar bars from local raw trade dumps and saves them per symbol
+        into data/<bar_type>_bars_<threshold>/, apart from the 1m caches process() reads.
+        :param trade_files: mapping of symbol to trade file path (CSV or parquet)
+        :param bar_type: "volume" or "dollar"
+        :param threshold: base volume (volume bars) or quote volume (dollar bars) per bar
+        :param max_workers: number of worker processes, one symbol per worker
+        :return: mapping of symbol to its bars
+        """
+        if bar_type == "time":
+            raise ValueError("Use ingest_trades for time bars")
+        aggregator = TradeAggregator(self.start_date, self.end_date, bar_type=bar_type, threshold=threshold,
+                                     max_workers=max_workers)
+        bars = aggregator.aggregate(trade_files)
+        bars_dir = f"{bar_type}_bars_{threshold:g}"
+        for symbol, df in bars.items():
+            self.save_data(df, os.path.join(bars_dir, f"{symbol.replace('/', '_')}.parquet"))
+        return bars
+
+    def process(self, num_of_pairs: int, filename: str = "btc_1m_feb25.parquet",
+                as_of: str = None) -> Tuple[List, pd.DataFrame]:
         """
         The main method for downloading, processing, and caching data.
         :param num_of_pairs: number of pairs
         :param filename: name of cache file
+        :param as_of: point-in-time selection date for the liquidity index, live tickers if None;
+            pairs of an existing cache file are used as is
         :return: result pandas dataframe
         """
         cached_df = self.load_cached_data(filename)
         if cached_df is not None and self.check_data_integrity(cached_df):
             logger.info("Use data from the cache!")
+            if as_of is not None:
+                logger.warning(f"as_of={as_of} is ignored, pairs are taken from the cache file {filename}")
+            self.liquidity_index.update(cached_df)
             pairs = cached_df.columns.get_level_values(0).unique().tolist()
             logger.info(f"Pairs: {pairs}")
             return pairs, cached_df
 
-        df = self.download_data(num_of_pairs)
+        df = self.download_data(num_of_pairs, as_of=as_of)
         if not self.check_data_integrity(df):
             raise ValueError("Data has integrity issues.")
         self.save_data(df, filename)
+        self.liquidity_index.update(df)
         return self.pairs, df
 
 
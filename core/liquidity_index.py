@@ -0,0 +1,100 @@
+import os
+from typing import List
+
+import pandas as pd
+from loguru import logger
+
+
+INDEX_COLUMNS = ["quote_volume", "coverage", "zero_volume_share"]
+MINUTES_PER_DAY = 1440
+
+
+class LiquidityIndex:
+    """
+    Locally maintained per-symbol, per-day liquidity index built from cached 1m OHLCV.
+    Rows are keyed by (date, symbol), so top-N selection for any historical date is an indexed query.
+    """
+
+    def __init__(self, output_folder: os.path, filename: str = "liquidity_index.parquet"):
+        self.filepath = os.path.join(output_folder, filename)
+        self.output_folder = output_folder
+        self.index = self._load()
+
+    def _load(self) -> pd.DataFrame:
+        """
+        Loads the index from disk if it exists.
+        :return: dataframe indexed by (date, symbol)
+        """
+        if os.path.exists(self.filepath):
+            return pd.read_parquet(self.filepath).sort_index()
+        empty_index = pd.MultiIndex.from_arrays([pd.DatetimeIndex([]), pd.Index([], dtype=object)],
+                                                names=["date", "symbol"])
+        return pd.DataFrame(columns=INDEX_COLUMNS, index=empty_index, dtype=float)
+
+    @staticmethod
+    def compute(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Computes daily liquidity statistics for every symbol of a multi-index OHLCV dataframe.
+        Only days with all 1440 minutes in the frame are used, so a partial day at the edge of a cache file
+        never enters the index. Minutes that DataLoader filled with zeros count as missing bars.
+        :param df: dataframe with multi-index columns (symbol, ohlcv) of 1m bars
+        :return: dataframe indexed by (date, symbol) with quote volume, bar coverage and zero-volume share
+        """
+        close = df.xs("close", level=1, axis=1)
+        volume = df.xs("volume", level=1, axis=1)
+        day = close.index.normalize()
+        minutes = close.groupby(day).size()
+        complete_days = minutes.index[minutes == MINUTES_PER_DAY]
+
+        daily = {
+            "quote_volume": (close * volume).groupby(day).sum(),
+            "coverage": (close > 0).groupby(day).sum() / MINUTES_PER_DAY,
+            "zero_volume_share": (volume == 0).groupby(day).sum() / MINUTES_PER_DAY,
+        }
+        stats = pd.concat({name: frame.loc[complete_days].stack() for name, frame in daily.items()}, axis=1)
+        stats.index.names = ["date", "symbol"]
+        return stats.astype(float)
+
+    def update(self, df: pd.DataFrame):
+        """
+        Adds daily statistics of the complete days in the given OHLCV data to the index,
+        replacing rows for the same (date, symbol), and saves the index.
+        :param df: dataframe with multi-index columns (symbol, ohlcv)
+        """
+        stats = self.compute(df)
+        index = pd.concat([self.index, stats]) if not self.index.empty else stats
+        self.index = index[~index.index.duplicated(keep="last")].sort_index()
+        self.save()
+        logger.info(f"Liquidity index updated with {len(stats)} rows")
+
+    def save(self):
+        """
+        Saves the index in Parquet format with compression.
+        """
+        if not os.path.exists(self.output_folder):
+            os.makedirs(self.output_folder)
+        self.index.to_parquet(self.filepath, compression="snappy")
+
+    def top_n(self, as_of: str, n: int, lookback_days: int = 1, min_coverage: float = 0.0,
+              quote: str = None) -> List[str]:
+        """
+        Point-in-time selection of the n most liquid symbols. Only the days before as_of are used, and only
+        symbols that traded in that window are ranked, so delisted symbols are kept for their historical dates.
+        :param as_of: selection date, its own statistics are not used
+        :param n: num of pairs
+        :param lookback_days: number of days before as_of to average over
+        :param min_coverage: minimal average share of minutes with a bar
+        :param quote: keep only symbols quoted in this currency (e.g. "BTC")
+        :return: list of top n liquid pairs
+        """
+        end = pd.to_datetime(as_of).normalize() - pd.Timedelta(days=1)
+        start = end - pd.Timedelta(days=lookback_days - 1)
+        window = self.index.loc[pd.IndexSlice[start:end, :], :]
+        if window.empty:
+            raise ValueError(f"Liquidity index has no data between {start.date()} and {end.date()}")
+
+        stats = window.groupby(level="symbol").mean()
+        stats = stats[stats["coverage"] >= min_coverage]
+        if quote is not None:
+            stats = stats[stats.index.str.endswith(f"/{quote}")]
+        return stats["quote_volume"].nlargest(n).index.tolist()
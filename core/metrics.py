@@ -3,7 +3,88 @@ import os
 from typing import List, Dict
 from loguru import logger
 import numpy as np
+import pandas as pd
 import vectorbt as vbt
+from numba import njit
+
+
+SEGMENTS = ("day", "week", "hour")
+
+
+def _rolling_sum(a: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling sum along the time axis of a 2D array in O(n) using a cumulative sum.
+    The first window - 1 rows are NaN.
+    :param a: 2D array (time x columns)
+    :param window: window length in bars, at least 1
+    :return: 2D array of rolling sums
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    csum = np.cumsum(a, axis=0, dtype=np.float64)
+    out = np.full(a.shape, np.nan)
+    if window > len(a):
+        return out
+    out[window - 1] = csum[window - 1]
+    out[window:] = csum[window:] - csum[:-window]
+    return out
+
+
+@njit(cache=True)
+def _rolling_mean_var_nb(a: np.ndarray, window: int):
+    """
+    Rolling mean and sample variance along the time axis of a 2D array in O(n),
+    using Welford's online update with removal of the value leaving the window.
+    A window of identical values gets exactly zero variance, and the accumulators are reset on it,
+    so rounding left over from earlier values does not leak into flat periods.
+    The first window - 1 rows are NaN.
+    """
+    n_rows, n_cols = a.shape
+    mean_out = np.full((n_rows, n_cols), np.nan)
+    var_out = np.full((n_rows, n_cols), np.nan)
+    for col in range(n_cols):
+        mean = 0.0
+        m2 = 0.0
+        count = 0
+        same_run = 0
+        for i in range(n_rows):
+            x = a[i, col]
+            if i > 0 and x == a[i - 1, col]:
+                same_run += 1
+            else:
+                same_run = 1
+            if count < window:
+                count += 1
+                delta = x - mean
+                mean += delta / count
+                m2 += delta * (x - mean)
+            else:
+                x_old = a[i - window, col]
+                old_mean = mean
+                mean += (x - x_old) / window
+                m2 += (x - x_old) * (x - mean + x_old - old_mean)
+            if same_run >= window:
+                mean = x
+                m2 = 0.0
+            if count == window:
+                mean_out[i, col] = mean
+                var_out[i, col] = max(m2, 0.0) / (window - 1)
+    return mean_out, var_out
+
+
+def _rolling_sharpe(returns: np.ndarray, window: int, ann_factor: float) -> np.ndarray:
+    """
+    Annualized rolling Sharpe ratio from an online rolling mean and variance of returns.
+    :param returns: 2D array of bar returns (time x columns)
+    :param window: window length in bars, at least 2
+    :param ann_factor: number of bars per year
+    :return: 2D array of rolling Sharpe ratios, NaN for windows without variance
+    """
+    mean, var = _rolling_mean_var_nb(np.ascontiguousarray(returns, dtype=np.float64), window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = mean / np.sqrt(var) * np.sqrt(ann_factor)
+    sharpe[~np.isfinite(sharpe)] = np.nan
+    return sharpe
 
 
 class Metrics:
@@ -15,25 +96,75 @@ class Metrics:
         self.portfolio = portfolio
         self.pairs = pairs
 
-    def _compute_exposure_time(self, threshold: float = 1e-6) -> float:
+    def _is_shared_cash(self) -> bool:
+        """
+        Whether all pairs are simulated as one portfolio with shared cash.
+        :return: bool
+        """
+        return self.portfolio.wrapper.grouper.is_grouped()
+
+    def _value(self) -> pd.DataFrame:
+        """
+        Portfolio value as a dataframe, also when a shared cash portfolio returns a single series.
+        :return: dataframe (time x columns)
+        """
+        value = self.portfolio.value()
+        return value.to_frame() if isinstance(value, pd.Series) else value
+
+    def _exposure_mask(self) -> np.ndarray:
+        """
+        Marks the bars with an open position for every column, built from position records
+        instead of materializing portfolio.value and portfolio.cash.
+        In a shared cash portfolio a bar is exposed when any pair has an open position.
+        :return: boolean 2D array (time x columns)
+        """
+        wrapper = self.portfolio.wrapper
+        n_rows, n_cols = wrapper.get_shape_2d()
+        records = self.portfolio.positions.values
+        cols = wrapper.grouper.get_groups()[records["col"]]
+        closed = records["status"] == 1
+        delta = np.zeros((n_rows + 1, n_cols), dtype=np.int64)
+        np.add.at(delta, (records["entry_idx"], cols), 1)
+        np.add.at(delta, (records["exit_idx"][closed], cols[closed]), -1)
+        return np.cumsum(delta[:n_rows], axis=0) > 0
+
+    def _turnover(self, value: np.ndarray) -> np.ndarray:
+        """
+        Traded notional per bar as a fraction of the portfolio value of that column.
+        :param value: 2D array of portfolio values (time x columns)
+        :return: 2D array of per-bar turnover
+        """
+        records = self.portfolio.orders.values
+        cols = self.portfolio.wrapper.grouper.get_groups()[records["col"]]
+        notional = np.zeros(value.shape)
+        np.add.at(notional, (records["idx"], cols), np.abs(records["size"] * records["price"]))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(value > 0, notional / value, 0.0)
+
+    def _ann_factor(self) -> float:
+        """
+        Number of bars per year, consistent with the annualization of portfolio.stats.
+        :return: bars per year
+        """
+        return pd.Timedelta(days=365) / self.portfolio.wrapper.freq
+
+    def _compute_exposure_time(self) -> float:
         """
         Calculates Exposure Time as the percentage of time the portfolio had open positions.
-        It uses the difference between portfolio.value and portfolio.cash.
-        :param threshold: a numerical threshold for determining an open position (1e-6 by default)
         :return: Exposure Time as a percentage (float)
         """
-        is_exposed = (self.portfolio.value() - self.portfolio.cash()).abs() > threshold
-        exposure_fraction = is_exposed.mean()
-        return exposure_fraction.mean() * 100
+        return self._exposure_mask().mean() * 100
 
     def aggregate_metrics(self) -> Dict:
         """
         Aggregates metrics for a portfolio of many trading pairs.
+        A shared cash portfolio is reported as a single column.
         :return: aggregated metrics as dict
         """
+        columns = self.portfolio.wrapper.get_columns().tolist() if self._is_shared_cash() else self.pairs
         sharpe_ratio_sum = 0
-        for pair in self.pairs:
-            sharpe_ratio = self.portfolio.stats(column=f'{pair}')['Sharpe Ratio']
+        for column in columns:
+            sharpe_ratio = self.portfolio.stats(column=f'{column}')['Sharpe Ratio']
             if not np.isinf(sharpe_ratio):
                 sharpe_ratio_sum += sharpe_ratio
             else:
@@ -43,7 +174,7 @@ class Metrics:
 
         aggregated = {
             "Total Return": self.portfolio.stats(agg_func=np.mean, silence_warnings=True)['Total Return [%]'],
-            "Sharpe Ratio": sharpe_ratio_sum/len(self.pairs),
+            "Sharpe Ratio": sharpe_ratio_sum/len(columns),
             "Max Drawdown %": self.portfolio.stats(agg_func=np.mean, silence_warnings=True)['Max Drawdown [%]'],
             "Win Rate %": self.portfolio.stats(agg_func=np.mean, silence_warnings=True)['Win Rate [%]'],
             "Expectancy": self.portfolio.stats(agg_func=np.mean, silence_warnings=True)['Expectancy'],
@@ -52,6 +183,80 @@ class Metrics:
 
         return aggregated
 
+    def rolling_metrics(self, window: int = 1440) -> Dict[str, pd.DataFrame]:
+        """
+        Rolling-window Sharpe ratio, drawdown, exposure and turnover for all pairs at once.
+        Sums over the window are computed with O(n) cumulative-sum kernels.
+        :param window: window length in bars (1440 by default, one day of 1m bars)
+        :return: dict of metric name to dataframe (time x pairs)
+        """
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        wrapper = self.portfolio.wrapper
+        value_df = self._value()
+        value = value_df.to_numpy(dtype=np.float64)
+        returns = np.zeros_like(value)
+        returns[1:] = value[1:] / value[:-1] - 1
+        returns[~np.isfinite(returns)] = 0.0
+
+        rolling_peak = value_df.rolling(window, min_periods=1).max().to_numpy()
+        metrics = {
+            "Sharpe Ratio": _rolling_sharpe(returns, window, self._ann_factor()),
+            "Drawdown %": (value / rolling_peak - 1) * 100,
+            "Exposure Time %": _rolling_sum(self._exposure_mask(), window) / window * 100,
+            "Turnover": _rolling_sum(self._turnover(value), window),
+        }
+        return {name: pd.DataFrame(data, index=wrapper.index, columns=value_df.columns)
+                for name, data in metrics.items()}
+
+    def segmented_metrics(self, segment: str = "day") -> Dict[str, pd.DataFrame]:
+        """
+        Calendar-segmented Sharpe ratio, max drawdown, exposure and turnover for all pairs at once.
+        :param segment: "day", "week" or "hour" (hour of day, 0-23)
+        :return: dict of metric name to dataframe (segments x pairs)
+        """
+        if segment not in SEGMENTS:
+            raise ValueError(f"Unknown segment: {segment}")
+        wrapper = self.portfolio.wrapper
+        if segment == "hour":
+            key = pd.Index(wrapper.index.hour, name="hour")
+        else:
+            key = pd.Index(wrapper.index.to_period(segment[0].upper()).start_time, name=segment)
+
+        value = self._value()
+        returns = value.pct_change().replace([np.inf, -np.inf], np.nan).fillna(0.0)
+        exposed = pd.DataFrame(self._exposure_mask(), index=wrapper.index, columns=value.columns)
+        turnover = pd.DataFrame(self._turnover(value.to_numpy(dtype=np.float64)),
+                                index=wrapper.index, columns=value.columns)
+
+        grouped_returns = returns.groupby(key)
+        sharpe = grouped_returns.mean() / grouped_returns.std() * np.sqrt(self._ann_factor())
+        metrics = {
+            "Sharpe Ratio": sharpe.replace([np.inf, -np.inf], np.nan),
+            "Exposure Time %": exposed.groupby(key).mean() * 100,
+            "Turnover": turnover.groupby(key).sum(),
+        }
+        # Hour-of-day segments are not contiguous in time, so drawdown is only reported per calendar segment
+        if segment != "hour":
+            metrics["Max Drawdown %"] = (value / value.groupby(key).cummax() - 1).groupby(key).min() * 100
+        return metrics
+
+    @staticmethod
+    def save_to_npz(metrics: Dict[str, pd.DataFrame], path: os.path):
+        """
+        Exports rolling or segmented metrics as compact float32 arrays for dashboards.
+        Every metric is stored under its name, along with the shared index and pair names.
+        :param metrics: dict of metric name to dataframe, all with the same index and columns
+        :param path: path of the .npz file
+        """
+        first = next(iter(metrics.values()))
+        index = first.index.to_numpy()
+        if np.issubdtype(index.dtype, np.datetime64):
+            index = index.astype("datetime64[ns]").astype(np.int64)
+        arrays = {name: df.to_numpy(dtype=np.float32) for name, df in metrics.items()}
+        np.savez_compressed(path, index=index, columns=np.asarray(first.columns, dtype=str), **arrays)
+        logger.info(f"Metrics arrays are saved in {path}")
+
     @staticmethod
     def save_to_csv(metrics: Dict, path: os.path):
         with open(path, 'w') as file:
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+from numba import njit
+from vectorbt.portfolio.enums import Direction
+from vectorbt.portfolio.nb import order_nb, order_nothing_nb
+
+
+@njit(cache=True)
+def _pre_segment_nb(c, entries, exits, priority, close, max_positions, position_size, order_size):
+    """
+    Cross-sectional allocation for one bar of the shared cash group.
+    Closes positions with an exit signal first, then opens new positions on entry signals in order of
+    priority while there are free slots, each sized as a fraction of the current group value.
+    Exits are placed first in the call sequence, so the freed cash is available to the entries of the same bar.
+    """
+    group_len = c.to_col - c.from_col
+    used = np.zeros(group_len, dtype=np.bool_)
+    group_value = c.last_cash[c.group]
+    n_open = 0
+    for col in range(c.from_col, c.to_col):
+        order_size[col] = np.nan
+        if np.isfinite(close[c.i, col]) and close[c.i, col] > 0:
+            c.last_val_price[col] = close[c.i, col]
+        if c.last_position[col] > 0:
+            group_value += c.last_position[col] * c.last_val_price[col]
+            n_open += 1
+
+    k = 0
+    for col in range(c.from_col, c.to_col):
+        tradable = np.isfinite(close[c.i, col]) and close[c.i, col] > 0
+        if tradable and c.last_position[col] > 0 and exits[c.i, col] and not entries[c.i, col]:
+            order_size[col] = -c.last_position[col]
+            c.call_seq_now[k] = col - c.from_col
+            used[col - c.from_col] = True
+            k += 1
+            n_open -= 1
+
+    free_slots = max_positions - n_open
+    for idx in np.argsort(-priority[c.i, c.from_col:c.to_col], kind="mergesort"):
+        if free_slots <= 0:
+            break
+        col = c.from_col + idx
+        tradable = np.isfinite(close[c.i, col]) and close[c.i, col] > 0
+        if tradable and c.last_position[col] == 0 and entries[c.i, col] and not exits[c.i, col]:
+            order_size[col] = position_size * group_value / close[c.i, col]
+            c.call_seq_now[k] = idx
+            used[idx] = True
+            k += 1
+            free_slots -= 1
+
+    for idx in range(group_len):
+        if not used[idx]:
+            c.call_seq_now[k] = idx
+            k += 1
+    return (order_size,)
+
+
+@njit(cache=True)
+def _order_func_nb(c, order_size, fees, slippage):
+    size = order_size[c.col]
+    if np.isnan(size):
+        return order_nothing_nb()
+    return order_nb(size=size, direction=Direction.LongOnly, fees=fees, slippage=slippage)
+
+
+def simulate_shared_cash(close: pd.DataFrame, entries: pd.DataFrame, exits: pd.DataFrame,
+                         init_cash: float = 10000, max_positions: int = 10, position_size: float = None,
+                         priority: pd.DataFrame = None, fees: float = 0.001, slippage: float = 0.001,
+                         freq: str = "1min") -> vbt.Portfolio:
+    """
+    Simulates all pairs as one long-only portfolio with a shared cash pool in a single compiled pass over time.
+    :param close: close prices (time x pairs)
+    :param entries: entry signals (time x pairs)
+    :param exits: exit signals (time x pairs)
+    :param init_cash: initial cash of the whole portfolio
+    :param max_positions: maximal number of concurrently open positions across all pairs
+    :param position_size: fraction of the portfolio value per new position (1 / max_positions by default)
+    :param priority: score to rank competing entries of the same bar, higher first (column order by default)
+    :param fees: commission per order
+    :param slippage: slippage per order
+    :param freq: bar frequency
+    :return: vbt.Portfolio grouped into a single column with shared cash
+    """
+    if max_positions < 1:
+        raise ValueError("max_positions must be at least 1")
+    if position_size is None:
+        position_size = 1 / max_positions
+
+    close_arr = close.to_numpy(dtype=np.float64)
+    entries_arr = entries.reindex_like(close).fillna(False).to_numpy(dtype=np.bool_)
+    exits_arr = exits.reindex_like(close).fillna(False).to_numpy(dtype=np.bool_)
+    if priority is None:
+        priority_arr = np.zeros(close_arr.shape)
+    else:
+        priority_arr = np.nan_to_num(priority.reindex_like(close).to_numpy(dtype=np.float64), nan=-np.inf)
+    order_size = np.full(close_arr.shape[1], np.nan)
+
+    return vbt.Portfolio.from_order_func(
+        close,
+        _order_func_nb,
+        float(fees),
+        float(slippage),
+        pre_segment_func_nb=_pre_segment_nb,
+        pre_segment_args=(entries_arr, exits_arr, priority_arr, close_arr, int(max_positions),
+                          float(position_size), order_size),
+        init_cash=init_cash,
+        cash_sharing=True,
+        group_by=True,
+        freq=freq,
+    )
@@ -0,0 +1,187 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+from loguru import logger
+
+
+BAR_TYPES = ("time", "volume", "dollar")
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+_PARTIAL_AGG = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+    "datetime": "last",
+}
+
+
+def _to_datetime(values: pd.Series) -> pd.Series:
+    """
+    Converts a raw trade timestamp column (epoch milliseconds or datetime strings) to naive UTC datetimes.
+    :param values: raw timestamp column
+    :return: datetime column
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_datetime(values, unit="ms")
+    return pd.to_datetime(values, utc=True).dt.tz_localize(None)
+
+
+def aggregate_trades(path: str, bar_type: str = "time", threshold: float = None, batch_size: int = 1_000_000,
+                     timestamp_col: str = "timestamp", price_col: str = "price",
+                     amount_col: str = "amount") -> pd.DataFrame:
+    """
+    Streams a raw trade file (CSV or parquet) in Arrow record batches and aggregates it into OHLCV bars.
+    Each batch is reduced to partial bars with a vectorized groupby; partials are merged at the end,
+    so memory is bounded by the batch size plus the number of bars, not by the number of trades.
+    :param path: path to the trade file, trades are expected in chronological order
+    :param bar_type: "time" (1m bars), "volume" or "dollar"
+    :param threshold: base volume (volume bars) or quote volume (dollar bars) per bar
+    :param batch_size: max number of trades per record batch
+    :param timestamp_col: name of the trade timestamp column
+    :param price_col: name of the trade price column
+    :param amount_col: name of the trade amount column
+    :return: dataframe of OHLCV bars, indexed by datetime for time bars and by (datetime, bar)
+        for volume and dollar bars, as several of them can close on the same timestamp
+    """
+    if bar_type not in BAR_TYPES:
+        raise ValueError(f"Unknown bar type: {bar_type}")
+    if bar_type != "time" and (threshold is None or threshold <= 0):
+        raise ValueError(f"A positive threshold is required for {bar_type} bars")
+
+    file_format = "csv" if path.endswith(".csv") else "parquet"
+    dataset = ds.dataset(path, format=file_format)
+    scanner = dataset.scanner(columns=[timestamp_col, price_col, amount_col], batch_size=batch_size)
+
+    partials = []
+    offset = 0.0
+    for batch in scanner.to_batches():
+        if batch.num_rows == 0:
+            continue
+        trades = batch.to_pandas()
+        datetime = _to_datetime(trades[timestamp_col])
+        price = trades[price_col].to_numpy(dtype=np.float64)
+        amount = trades[amount_col].to_numpy(dtype=np.float64)
+
+        if bar_type == "time":
+            key = datetime.dt.floor("min").to_numpy()
+        else:
+            size = amount if bar_type == "volume" else price * amount
+            cum_size = offset + np.cumsum(size)
+            key = ((cum_size - size) // threshold).astype(np.int64)
+            offset = cum_size[-1]
+
+        frame = pd.DataFrame({
+            "open": price,
+            "high": price,
+            "low": price,
+            "close": price,
+            "volume": amount,
+            "datetime": datetime.to_numpy(),
+        })
+        partials.append(frame.groupby(key, sort=False).agg(_PARTIAL_AGG))
+
+    if not partials:
+        raise ValueError(f"No trades found in {path}")
+
+    bars = pd.concat(partials).groupby(level=0, sort=False).agg(_PARTIAL_AGG)
+    if bar_type != "time":
+        bars.index = pd.MultiIndex.from_arrays([bars.pop("datetime"), np.arange(len(bars))],
+                                               names=["datetime", "bar"])
+    else:
+        bars.drop(columns=["datetime"], inplace=True)
+        bars.index.name = "datetime"
+    return bars[OHLCV_COLUMNS]
+
+
+def _aggregate_symbol(symbol: str, path: str, kwargs: Dict) -> pd.DataFrame:
+    logger.info(f"Aggregating trades for {symbol} from {path}...")
+    return aggregate_trades(path, **kwargs)
+
+
+class TradeAggregator:
+    """
+    Builds OHLCV bars from local raw trade dumps: 1m bars in the layout DataLoader.process() consumes,
+    volume and dollar bars per symbol.
+    """
+
+    def __init__(self, start_date: str, end_date: str, bar_type: str = "time", threshold: float = None,
+                 batch_size: int = 1_000_000, max_workers: int = None, timestamp_col: str = "timestamp",
+                 price_col: str = "price", amount_col: str = "amount"):
+        if bar_type not in BAR_TYPES:
+            raise ValueError(f"Unknown bar type: {bar_type}")
+        self.start_date = pd.to_datetime(start_date)
+        self.end_date = pd.to_datetime(end_date)
+        self.bar_type = bar_type
+        self.max_workers = max_workers
+        self.aggregate_kwargs = {
+            "bar_type": bar_type,
+            "threshold": threshold,
+            "batch_size": batch_size,
+            "timestamp_col": timestamp_col,
+            "price_col": price_col,
+            "amount_col": amount_col,
+        }
+        self.pairs = []
+
+    def _to_grid(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aligns time bars to the full minute grid of the period, filling gaps with zeros like DataLoader does.
+        :param bars: 1m bars of a single symbol
+        :return: 1m bars reindexed to the period
+        """
+        complete_index = pd.date_range(self.start_date, self.end_date, freq="min")
+        return bars.reindex(complete_index).fillna(0)
+
+    def aggregate(self, trade_files: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+        """
+        Aggregates trade files into bars, one worker process per symbol.
+        Time bars are aligned to the minute grid of the period; volume and dollar bars keep their own
+        close timestamps and are only cut to the period.
+        :param trade_files: mapping of symbol to trade file path
+        :return: mapping of symbol to its bars, for the symbols that could be aggregated
+        """
+        bars = {}
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                symbol: executor.submit(_aggregate_symbol, symbol, path, self.aggregate_kwargs)
+                for symbol, path in trade_files.items()
+            }
+            for symbol, future in futures.items():
+                try:
+                    df = future.result()
+                except Exception as e:
+                    logger.error(f"Missing {symbol} through the error: {e}")
+                    continue
+                if self.bar_type == "time":
+                    df = self._to_grid(df)
+                else:
+                    datetime = df.index.get_level_values("datetime")
+                    df = df[(datetime >= self.start_date) & (datetime <= self.end_date)]
+                bars[symbol] = df
+
+        if not bars:
+            raise ValueError("Unable to aggregate trades for any pair")
+        self.pairs = list(bars.keys())
+        return bars
+
+    def process(self, trade_files: Dict[str, str]) -> pd.DataFrame:
+        """
+        Aggregates trade files into 1m bars in the multi-index layout DataLoader.process() consumes.
+        Volume and dollar bars of different symbols do not share timestamps, use aggregate() for them.
+        :param trade_files: mapping of symbol to trade file path
+        :return: summary DataFrame with multi-index columns
+        """
+        if self.bar_type != "time":
+            raise ValueError(f"Only time bars can be combined into one frame, not {self.bar_type} bars")
+        data_frames = []
+        for symbol, df in self.aggregate(trade_files).items():
+            df.columns = pd.MultiIndex.from_product([[symbol], df.columns])
+            data_frames.append(df)
+        combined = pd.concat(data_frames, axis=1)
+        combined.sort_index(inplace=True)
+        return combined
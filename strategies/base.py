@@ -2,13 +2,52 @@ import os
 from abc import ABC, abstractmethod
 from typing import Dict
 
+import numpy as np
 import pandas as pd
 import vectorbt as vbt
 
+from core.portfolio import simulate_shared_cash
+
 
 class StrategyBase(ABC):
     def __init__(self, price_data: pd.DataFrame):
         self.price_data = price_data
+        self.backtest_result = None
+
+    def get_close(self) -> pd.DataFrame:
+        """
+        Close prices used for the backtest. DataLoader fills missing minutes with 0,
+        those are treated as missing and forward-filled with the last traded price.
+        :return: dataframe of close prices (time x pairs)
+        """
+        close = self.price_data.xs("close", level=1, axis=1)
+        return close.replace(0, np.nan).ffill()
+
+    def run_shared_cash_backtest(self, init_cash: float = 10000, max_positions: int = 10,
+                                 position_size: float = None) -> vbt.Portfolio:
+        """
+        Launches a strategy backtest of all pairs as one portfolio with a shared cash pool.
+        Competing entries of the same bar are ranked by signals["priority"] if the strategy provides it,
+        otherwise by the order of pairs.
+        :param init_cash: initial cash of the whole portfolio
+        :param max_positions: maximal number of concurrently open positions
+        :param position_size: fraction of the portfolio value per new position (1 / max_positions by default)
+        :return: vbt.Portfolio for backtest results
+        """
+        signals = self.generate_signals()
+        self.backtest_result = simulate_shared_cash(
+            self.get_close(),
+            entries=signals["entries"],
+            exits=signals["exits"],
+            init_cash=init_cash,
+            max_positions=max_positions,
+            position_size=position_size,
+            priority=signals.get("priority"),
+            fees=0.001,
+            slippage=0.001,
+            freq="1min"
+        )
+        return self.backtest_result
 
     @abstractmethod
     def generate_signals(self) -> Dict:
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def make_price_data():
+    """
+    Factory of 1m OHLCV data with multi-index columns, where every pair follows a geometric random walk.
+    """
+    def _make(periods: int, symbols: list) -> pd.DataFrame:
+        rng = np.random.default_rng(0)
+        index = pd.date_range("2025-02-01", periods=periods, freq="min")
+        data = {}
+        for symbol in symbols:
+            df = pd.DataFrame(index=index)
+            df["close"] = 100 * np.exp(rng.normal(0, 0.002, len(index)).cumsum())
+            df["open"] = df["close"]
+            df["high"] = df["close"]
+            df["low"] = df["close"]
+            df["volume"] = 5
+            data[symbol] = df
+        return pd.concat(data, axis=1)
+    return _make
@@ -7,6 +7,7 @@ from pathlib import Path
 import vectorbt as vbt
 from core.backtester import Backtester
 from strategies.base import StrategyBase
+from strategies.sma_cross import SMACrossStrategy
 
 
 class DummyWrapper:
@@ -86,3 +87,17 @@ def test_backtester(tmp_path: Path):
         assert os.path.exists(file_path)
 
     assert metrics.get("dummy_metric") == 42
+
+
+def test_backtester_cash_sharing(tmp_path: Path, make_price_data):
+    price_data = make_price_data(200, ["PAIR1BTC", "PAIR2BTC", "PAIR3BTC"])
+
+    strategy = SMACrossStrategy(price_data=price_data, fast_window=5, slow_window=15,
+                                pairs=["PAIR1BTC", "PAIR2BTC", "PAIR3BTC"])
+    backtester = Backtester(strategy, "SharedSMA", tmp_path, cash_sharing=True, max_positions=2)
+
+    metrics = backtester.run()
+
+    assert os.path.exists(os.path.join(backtester.results_dir, "SharedSMA_metrics.csv"))
+    assert os.path.exists(os.path.join(backtester.html_dir, "SharedSMA_heatmap.html"))
+    assert metrics["Total Return"] == pytest.approx(strategy.backtest_result.total_return() * 100)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.data_loader import DataLoader
+from core.liquidity_index import LiquidityIndex
+
+
+@pytest.fixture
+def ohlcv():
+    rng = pd.date_range("2025-02-01", periods=3 * 1440, freq="min")
+    data = {}
+    for symbol, volume in [("AAA/BTC", 1.0), ("BBB/BTC", 2.0), ("CCC/ETH", 10.0)]:
+        df = pd.DataFrame(index=rng)
+        df["open"] = 1.0
+        df["high"] = 1.0
+        df["low"] = 1.0
+        df["close"] = 1.0
+        df["volume"] = volume
+        data[symbol] = df
+    combined = pd.concat(data, axis=1)
+    # BBB/BTC is delisted after the first day
+    combined.loc["2025-02-02":, "BBB/BTC"] = 0
+    return combined
+
+
+def test_compute(ohlcv):
+    stats = LiquidityIndex.compute(ohlcv)
+    day = stats.loc[(pd.Timestamp("2025-02-01"), "BBB/BTC")]
+    assert day["quote_volume"] == 2.0 * 1440
+    assert day["coverage"] == 1.0
+    assert stats.loc[(pd.Timestamp("2025-02-02"), "BBB/BTC"), "zero_volume_share"] == 1.0
+
+
+def test_top_n_point_in_time(tmp_path, ohlcv):
+    index = LiquidityIndex(str(tmp_path))
+    index.update(ohlcv)
+
+    assert index.top_n("2025-02-02", 1, quote="BTC") == ["BBB/BTC"]
+    assert index.top_n("2025-02-03", 1, quote="BTC") == ["AAA/BTC"]
+    assert index.top_n("2025-02-03", 2, min_coverage=0.5) == ["CCC/ETH", "AAA/BTC"]
+
+    reloaded = LiquidityIndex(str(tmp_path))
+    assert np.allclose(reloaded.index.values, index.index.values)
+    with pytest.raises(ValueError):
+        reloaded.top_n("2025-02-01", 1)
+
+
+def test_index_updated_from_cache(tmp_path, ohlcv):
+    loader = DataLoader(project_dir=str(tmp_path), start_date="2025-02-01", end_date="2025-02-03 23:59")
+    loader.save_data(ohlcv, "cached.parquet")
+
+    pairs, _ = loader.process(num_of_pairs=2, filename="cached.parquet", as_of="2025-02-02")
+
+    assert pairs == ["AAA/BTC", "BBB/BTC", "CCC/ETH"]
+    assert loader.get_top_liquid_pairs(1, as_of="2025-02-02") == ["BBB/BTC"]
+
+
+def test_partial_days_skipped(tmp_path, ohlcv):
+    index = LiquidityIndex(str(tmp_path))
+    index.update(ohlcv.loc[:"2025-02-02 00:00"])
+
+    assert index.index.index.get_level_values("date").unique().tolist() == [pd.Timestamp("2025-02-01")]
+    with pytest.raises(ValueError):
+        index.top_n("2025-02-03", 1)
+
+    index.update(ohlcv)
+    index.update(ohlcv.loc["2025-02-02 00:00":"2025-02-02 00:05"])
+    assert index.index.loc[(pd.Timestamp("2025-02-02"), "AAA/BTC"), "quote_volume"] == 1440.0
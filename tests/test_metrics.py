@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+import vectorbt as vbt
+
+from core.metrics import Metrics, _rolling_sharpe, _rolling_sum
+
+
+@pytest.fixture
+def portfolio(make_price_data):
+    close = make_price_data(3 * 1440, ["PAIR1BTC", "PAIR2BTC"]).xs("close", level=1, axis=1)
+    fast_sma = close.rolling(5).mean()
+    slow_sma = close.rolling(15).mean()
+    return vbt.Portfolio.from_signals(close, entries=fast_sma > slow_sma, exits=fast_sma < slow_sma,
+                                      init_cash=10000, fees=0.001, slippage=0.001, freq="1min")
+
+
+def test_rolling_sum():
+    a = np.arange(10, dtype=float).reshape(5, 2)
+    expected = pd.DataFrame(a).rolling(3).sum().to_numpy()
+    assert np.allclose(_rolling_sum(a, 3), expected, equal_nan=True)
+
+
+def test_exposure_time(portfolio):
+    metrics = Metrics(portfolio, ["PAIR1BTC", "PAIR2BTC"])
+    expected = ((portfolio.value() - portfolio.cash()).abs() > 1e-6).mean().mean() * 100
+    assert metrics._compute_exposure_time() == pytest.approx(expected)
+
+
+def test_rolling_metrics(portfolio):
+    metrics = Metrics(portfolio, ["PAIR1BTC", "PAIR2BTC"])
+    rolling = metrics.rolling_metrics(window=60)
+
+    expected = portfolio.returns().rolling(60).apply(lambda r: r.mean() / r.std() * np.sqrt(525600))
+    assert np.allclose(rolling["Sharpe Ratio"], expected, equal_nan=True)
+    assert (rolling["Drawdown %"] <= 0).all().all()
+    assert rolling["Exposure Time %"].stack().between(0, 100).all()
+
+
+def test_segmented_metrics(tmp_path, portfolio):
+    metrics = Metrics(portfolio, ["PAIR1BTC", "PAIR2BTC"])
+    daily = metrics.segmented_metrics("day")
+    hourly = metrics.segmented_metrics("hour")
+
+    assert daily["Max Drawdown %"].shape == (3, 2)
+    assert hourly["Sharpe Ratio"].shape == (24, 2)
+    assert "Max Drawdown %" not in hourly
+    assert daily["Turnover"].sum().sum() == pytest.approx(hourly["Turnover"].sum().sum())
+
+    path = tmp_path / "daily.npz"
+    Metrics.save_to_npz(daily, path)
+    arrays = np.load(path)
+    assert arrays["Exposure Time %"].dtype == np.float32
+    assert arrays["columns"].tolist() == ["PAIR1BTC", "PAIR2BTC"]
+
+
+def test_aggregate_metrics(portfolio):
+    metrics = Metrics(portfolio, ["PAIR1BTC", "PAIR2BTC"])
+    aggregated = metrics.aggregate_metrics()
+    assert aggregated["Exposure Time %"] == pytest.approx(metrics._compute_exposure_time())
+    assert aggregated["Total Return"] == pytest.approx(portfolio.total_return().mean() * 100)
+
+
+def test_rolling_sharpe_low_variance():
+    rng = np.random.default_rng(1)
+    returns = np.zeros((500, 2))
+    returns[:200] = rng.normal(0, 0.01, (200, 2))
+    returns[300:] = 1e-4 + rng.normal(0, 1e-9, (200, 2))
+
+    sharpe = _rolling_sharpe(returns, 50, 525600)
+    expected = pd.DataFrame(returns).rolling(50).apply(lambda r: r.mean() / r.std() * np.sqrt(525600))
+
+    assert np.isnan(sharpe[250:300]).all()
+    assert np.isfinite(sharpe[350:]).all()
+    assert np.allclose(sharpe[350:], expected.to_numpy()[350:], rtol=1e-4)
+
+
+def test_rolling_window_validation(portfolio):
+    metrics = Metrics(portfolio, ["PAIR1BTC", "PAIR2BTC"])
+    with pytest.raises(ValueError):
+        metrics.rolling_metrics(window=1)
+    with pytest.raises(ValueError):
+        _rolling_sum(np.ones((5, 1)), 0)
@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+from core.metrics import Metrics
+from core.portfolio import simulate_shared_cash
+from strategies.rsi_bb import RSIBBStrategy
+from strategies.sma_cross import SMACrossStrategy
+
+
+@pytest.fixture
+def price_data(make_price_data):
+    return make_price_data(2000, ["PAIR1BTC", "PAIR2BTC", "PAIR3BTC", "PAIR4BTC"])
+
+
+def test_max_positions(price_data):
+    strategy = SMACrossStrategy(price_data=price_data, fast_window=5, slow_window=15,
+                                pairs=price_data.columns.get_level_values(0).unique().tolist())
+    portfolio = strategy.run_shared_cash_backtest(init_cash=10000, max_positions=2)
+
+    assert portfolio.wrapper.get_columns().tolist() == ["group"]
+    assert (portfolio.assets() > 0).sum(axis=1).max() == 2
+    assert portfolio.cash().min() >= 0
+    assert portfolio.init_cash == 10000
+
+
+def test_priority(price_data):
+    close = price_data.xs("close", level=1, axis=1)
+    entries = pd.DataFrame(False, index=close.index, columns=close.columns)
+    entries.iloc[10] = True
+    exits = pd.DataFrame(False, index=close.index, columns=close.columns)
+    priority = pd.DataFrame([[1.0, 4.0, 3.0, 2.0]], index=close.index[[10]], columns=close.columns)
+
+    portfolio = simulate_shared_cash(close, entries, exits, max_positions=2, priority=priority)
+    held = portfolio.assets().iloc[-1]
+
+    assert held[held > 0].index.tolist() == ["PAIR2BTC", "PAIR3BTC"]
+    assert portfolio.value().iloc[10] == pytest.approx(10000 * (1 - 0.001 - 0.001), rel=1e-3)
+
+
+def test_shared_cash_metrics(price_data):
+    pairs = price_data.columns.get_level_values(0).unique().tolist()
+    strategy = SMACrossStrategy(price_data=price_data, fast_window=5, slow_window=15, pairs=pairs)
+    portfolio = strategy.run_shared_cash_backtest(max_positions=3)
+
+    aggregated = Metrics(portfolio, pairs).aggregate_metrics()
+    assert aggregated["Total Return"] == pytest.approx(portfolio.total_return() * 100)
+    assert 0 < aggregated["Exposure Time %"] <= 100
+
+
+@pytest.mark.parametrize("strategy_cls", [SMACrossStrategy, RSIBBStrategy])
+def test_zero_filled_close(price_data, strategy_cls):
+    pairs = price_data.columns.get_level_values(0).unique().tolist()
+    price_data.loc[price_data.index[100:103], ("PAIR1BTC", "close")] = 0
+    price_data.loc[price_data.index[:5], ("PAIR2BTC", "close")] = 0
+    entries = pd.DataFrame(False, index=price_data.index, columns=pairs)
+    entries.iloc[50] = True
+    exits = pd.DataFrame(False, index=price_data.index, columns=pairs)
+
+    strategy = strategy_cls(price_data=price_data, pairs=pairs)
+    close = strategy.get_close()
+    portfolio = simulate_shared_cash(close, entries, exits, max_positions=4)
+    value = portfolio.value()
+
+    assert close.iloc[100:103]["PAIR1BTC"].eq(close.iloc[99]["PAIR1BTC"]).all()
+    assert value.notna().all()
+    assert value.pct_change().abs().max() < 0.05
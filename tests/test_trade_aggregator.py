@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.trade_aggregator import TradeAggregator, aggregate_trades
+
+
+@pytest.fixture
+def trades():
+    start = pd.Timestamp("2025-02-01").value // 10 ** 6
+    timestamps = start + np.array([0, 10, 20, 30, 60_000, 60_010, 180_000, 180_500])
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "price": [10.0, 12.0, 9.0, 11.0, 11.5, 11.0, 13.0, 14.0],
+        "amount": [1.0, 2.0, 1.0, 1.0, 3.0, 1.0, 2.0, 2.0],
+    })
+
+
+def test_time_bars_across_batches(tmp_path, trades):
+    path = str(tmp_path / "trades.parquet")
+    trades.to_parquet(path)
+    bars = aggregate_trades(path, bar_type="time", batch_size=3)
+
+    first = bars.iloc[0]
+    assert (first["open"], first["high"], first["low"], first["close"], first["volume"]) == (10.0, 12.0, 9.0, 11.0, 5.0)
+    assert bars["volume"].sum() == trades["amount"].sum()
+    assert len(bars) == 3
+
+
+def test_volume_bars_from_csv(tmp_path, trades):
+    path = str(tmp_path / "trades.csv")
+    trades.to_csv(path, index=False)
+    bars = aggregate_trades(path, bar_type="volume", threshold=4, batch_size=2)
+
+    assert bars["volume"].tolist() == [4.0, 4.0, 5.0]
+    assert bars["open"].tolist() == [10.0, 11.0, 11.0]
+    assert bars["close"].tolist() == [9.0, 11.5, 14.0]
+
+
+def test_dollar_bars_require_threshold(tmp_path, trades):
+    path = str(tmp_path / "trades.parquet")
+    trades.to_parquet(path)
+    with pytest.raises(ValueError):
+        aggregate_trades(path, bar_type="dollar")
+
+
+def test_aggregator_layout(tmp_path, trades):
+    paths = {}
+    for symbol in ["PAIR1/BTC", "PAIR2/BTC"]:
+        path = str(tmp_path / f"{symbol.replace('/', '_')}.parquet")
+        trades.to_parquet(path)
+        paths[symbol] = path
+
+    aggregator = TradeAggregator(start_date="2025-02-01", end_date="2025-02-01 00:05", max_workers=2)
+    df = aggregator.process(paths)
+
+    assert aggregator.pairs == ["PAIR1/BTC", "PAIR2/BTC"]
+    assert df.columns.get_level_values(0).unique().tolist() == ["PAIR1/BTC", "PAIR2/BTC"]
+    assert len(df) == 6
+    assert not df.isnull().any().any()
+
+
+def test_bars_closing_on_same_timestamp(tmp_path):
+    trades = pd.DataFrame({
+        "timestamp": [1_738_368_000_000] * 4,
+        "price": [10.0, 11.0, 12.0, 13.0],
+        "amount": [2.0, 2.0, 2.0, 2.0],
+    })
+    path = str(tmp_path / "burst.parquet")
+    trades.to_parquet(path)
+    bars = aggregate_trades(path, bar_type="volume", threshold=2)
+
+    assert bars.index.is_unique
+    assert bars.index.get_level_values("bar").tolist() == [0, 1, 2, 3]
+    assert bars["close"].tolist() == [10.0, 11.0, 12.0, 13.0]
+
+
+def test_timestamps_with_offset_to_utc(tmp_path):
+    trades = pd.DataFrame({
+        "timestamp": ["2025-02-01T02:00:10+02:00", "2025-02-01T00:01:10Z"],
+        "price": [10.0, 11.0],
+        "amount": [1.0, 1.0],
+    })
+    path = str(tmp_path / "trades.csv")
+    trades.to_csv(path, index=False)
+    bars = aggregate_trades(path, bar_type="time")
+
+    assert bars.index.tolist() == [pd.Timestamp("2025-02-01 00:00"), pd.Timestamp("2025-02-01 00:01")]
+
+
+def test_aggregator_bars_per_symbol(tmp_path, trades):
+    paths = {}
+    for symbol, shift in [("PAIR1/BTC", 0), ("PAIR2/BTC", 5)]:
+        path = str(tmp_path / f"{symbol.replace('/', '_')}.parquet")
+        trades.assign(timestamp=trades["timestamp"] + shift).to_parquet(path)
+        paths[symbol] = path
+
+    aggregator = TradeAggregator(start_date="2025-02-01", end_date="2025-02-01 00:05", bar_type="dollar",
+                                 threshold=40, max_workers=2)
+    bars = aggregator.aggregate(paths)
+
+    assert list(bars.keys()) == ["PAIR1/BTC", "PAIR2/BTC"]
+    assert bars["PAIR1/BTC"]["volume"].sum() == trades["amount"].sum()
+    with pytest.raises(ValueError):
+        aggregator.process(paths)